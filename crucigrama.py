@@ -10,9 +10,17 @@ Web Crossword (Flask single-file app)
 - No external assets; everything is embedded.
 """
 
+import base64
+import secrets
+import threading
 import unicodedata
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
 from typing import List, Tuple, Dict, Optional
-from flask import Flask, render_template_string, request, session, jsonify
+import numpy as np
+import orjson
+from flask import Flask, request, session, jsonify
+from flask.json.provider import DefaultJSONProvider
 
 # -------------------------
 # Data: clues and answers
@@ -39,6 +47,9 @@ RAW_ENTRIES = [
 ]
 
 GRID_SIZE = 27
+# Upper bound on backtracking steps in Crossword.generate before it settles
+# for the deepest partial layout found and places the rest greedily.
+MAX_SEARCH_NODES = 500
 
 # -------------------------
 # Normalization helpers
@@ -46,26 +57,49 @@ GRID_SIZE = 27
 def strip_accents(s: str) -> str:
     return ''.join(ch for ch in unicodedata.normalize('NFD', s) if unicodedata.category(ch) != 'Mn')
 
+# One table does the whole job for the usual input: lowercase ASCII and the
+# accented letters used in Spanish map to A-Z, any other ASCII is dropped.
+_NORM_TABLE = str.maketrans(
+    'abcdefghijklmnopqrstuvwxyzÁÉÍÓÚÜÑÇÀÈÌÒÙáéíóúüñçàèìòù',
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZAEIOUUNCAEIOUAEIOUUNCAEIOU',
+    ''.join(chr(i) for i in range(128) if not ('A' <= chr(i) <= 'Z' or 'a' <= chr(i) <= 'z')),
+)
+
 def normalize_answer(s: str) -> str:
+    out = s.translate(_NORM_TABLE)
+    if out.isascii():
+        return out
+    # Characters outside the table go through full decomposition.
     s = strip_accents(s).upper()
     return ''.join(ch for ch in s if 'A' <= ch <= 'Z')
 
 # -------------------------
 # Crossword structures
 # -------------------------
+# Per-byte masks for the SWAR check in Crossword.can_place, wide enough for
+# any row or column.
+_SWAR_LOW7 = int.from_bytes(b'\x7f' * GRID_SIZE, 'little')
+_SWAR_HIGH = int.from_bytes(b'\x80' * GRID_SIZE, 'little')
+# Orientation bit stored per cell in Crossword.cell_ori, and the same bit
+# repeated per byte for checking a whole row or column at once.
+_ORI_BIT = {'H': 1, 'V': 2}
+_SWAR_ORI = {ori: int.from_bytes(bytes([bit]) * GRID_SIZE, 'little') for ori, bit in _ORI_BIT.items()}
+
+@dataclass(slots=True)
 class Placement:
-    def __init__(self, word_id: int, row: int, col: int, orientation: str, length: int):
-        self.word_id = word_id
-        self.row = row
-        self.col = col
-        self.orientation = orientation  # 'H' or 'V'
-        self.length = length
-        self.number: Optional[int] = None
-
-    def cells(self) -> List[Tuple[int, int]]:
-        if self.orientation == 'H':
-            return [(self.row, self.col + i) for i in range(self.length)]
-        return [(self.row + i, self.col) for i in range(self.length)]
+    word_id: int
+    row: int
+    col: int
+    orientation: str  # 'H' or 'V'
+    length: int
+    number: Optional[int] = None
+    # Indices of the word's cells in the flat row-major grid.
+    cells_flat: Tuple[int, ...] = field(init=False)
+
+    def __post_init__(self):
+        step = 1 if self.orientation == 'H' else GRID_SIZE
+        start = self.row * GRID_SIZE + self.col
+        self.cells_flat = tuple(range(start, start + self.length * step, step))
 
 class Crossword:
     def __init__(self, entries: List[Tuple[str, str]]):
@@ -77,118 +111,177 @@ class Crossword:
             }
             for clue, ans in entries
         ]
+        for e in self.entries:
+            e['answer_bytes'] = e['answer_norm'].encode('ascii')
+            e['letters'] = frozenset(e['answer_bytes'])
         self.order = sorted(range(len(self.entries)), key=lambda i: len(self.entries[i]['answer_norm']), reverse=True)
-        self.grid: List[List[Optional[str]]] = [[None for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
-        self.used_mask: List[List[bool]] = [[False for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+        # Flat row-major grid, cell (r, c) at r * GRID_SIZE + c. Letters are
+        # stored as their ASCII code; 0 means an empty cell.
+        self.grid = bytearray(GRID_SIZE * GRID_SIZE)
+        # Orientations (_ORI_BIT) of the words through each cell. A word may
+        # only share cells with words of the other orientation, so every
+        # overlap is a crossing and no word is laid inside another.
+        self.cell_ori = bytearray(GRID_SIZE * GRID_SIZE)
         self.placements: List[Placement] = []
-
-    def can_place(self, word: str, r: int, c: int, ori: str) -> Tuple[bool, int]:
+        self.by_number: Dict[int, Placement] = {}  # filled in by generate()
+        # Letter code -> flat indices of the cells holding that letter.
+        self.letter_cells: Dict[int, List[int]] = defaultdict(list)
+        # Backtracking bookkeeping for generate(): search steps taken and the
+        # deepest partial layout reached, as (word_id, r, c, ori).
+        self._nodes = 0
+        self._best_partial: List[Tuple[int, int, int, str]] = []
+
+    def can_place(self, word: bytes, r: int, c: int, ori: str) -> Tuple[bool, int]:
+        grid, N = self.grid, GRID_SIZE
         L = len(word)
+        start = r * N + c
         if ori == 'H':
-            if c < 0 or c + L > GRID_SIZE or r < 0 or r >= GRID_SIZE:
-                return (False, 0)
-            if c - 1 >= 0 and self.grid[r][c - 1] is not None:
-                return (False, 0)
-            if c + L < GRID_SIZE and self.grid[r][c + L] is not None:
+            end = c + L
+            if (not (0 <= r < N and 0 <= c and end <= N)
+                    or (c and grid[start - 1]) or (end < N and grid[start + L])):
                 return (False, 0)
-            overlaps = 0
-            for i in range(L):
-                rr, cc = r, c + i
-                cell = self.grid[rr][cc]
-                if cell is not None and cell != word[i]:
-                    return (False, 0)
-                if cell == word[i]:
-                    overlaps += 1
-            return (True, overlaps)
+            cur = grid[start:start + L]
+            dirs = self.cell_ori[start:start + L]
         else:
-            if r < 0 or r + L > GRID_SIZE or c < 0 or c >= GRID_SIZE:
+            end = r + L
+            if (not (0 <= c < N and 0 <= r and end <= N)
+                    or (r and grid[start - N]) or (end < N and grid[start + L * N])):
                 return (False, 0)
-            if r - 1 >= 0 and self.grid[r - 1][c] is not None:
-                return (False, 0)
-            if r + L < GRID_SIZE and self.grid[r + L][c] is not None:
-                return (False, 0)
-            overlaps = 0
-            for i in range(L):
-                rr, cc = r + i, c
-                cell = self.grid[rr][cc]
-                if cell is not None and cell != word[i]:
-                    return (False, 0)
-                if cell == word[i]:
-                    overlaps += 1
-            return (True, overlaps)
-
-    def place(self, word_id: int, r: int, c: int, ori: str):
-        word = self.entries[word_id]['answer_norm']
+            cur = grid[start:start + L * N:N]
+            dirs = self.cell_ori[start:start + L * N:N]
+        # SWAR: treat the slice as one integer. Cells hold 0 or an ASCII letter
+        # (< 0x80), so adding 0x7f to every byte sets its high bit exactly when
+        # the byte is non-zero; no carry crosses into the next byte.
+        if int.from_bytes(dirs, 'little') & _SWAR_ORI[ori]:
+            return (False, 0)
+        g = int.from_bytes(cur, 'little')
+        occupied = (g + _SWAR_LOW7) & _SWAR_HIGH
+        if not occupied:
+            return (True, 0)
+        mismatched = ((g ^ int.from_bytes(word, 'little')) + _SWAR_LOW7) & _SWAR_HIGH
+        if occupied & mismatched:
+            return (False, 0)
+        return (True, occupied.bit_count())
+
+    def place(self, word_id: int, r: int, c: int, ori: str) -> List[int]:
+        """Write the word into the grid; returns the cells that were empty before."""
+        word = self.entries[word_id]['answer_bytes']
+        p = Placement(word_id, r, c, ori, len(word))
+        grid, cell_ori, bit = self.grid, self.cell_ori, _ORI_BIT[ori]
+        written = []
+        for i, ch in zip(p.cells_flat, word):
+            cell_ori[i] |= bit
+            if not grid[i]:  # crossings are already indexed
+                grid[i] = ch
+                self.letter_cells[ch].append(i)
+                written.append(i)
+        self.placements.append(p)
+        return written
+
+    def unplace(self, written: List[int]):
+        """Undo the most recent place(), given the cells it returned."""
+        for i in reversed(written):
+            self.letter_cells[self.grid[i]].pop()
+            self.grid[i] = 0
+        p = self.placements.pop()
+        bit = _ORI_BIT[p.orientation]
+        for i in p.cells_flat:
+            self.cell_ori[i] &= ~bit
+
+    def crossings(self, word: bytes) -> List[Tuple[int, int, str]]:
+        """Legal (r, c, ori) placements of word crossing the grid, best first:
+        most overlaps, then closest to the center."""
         L = len(word)
-        for i in range(L):
-            rr, cc = (r, c + i) if ori == 'H' else (r + i, c)
-            self.grid[rr][cc] = word[i]
-            self.used_mask[rr][cc] = True
-        self.placements.append(Placement(word_id, r, c, ori, L))
+        starts = set()
+        for j, ch in enumerate(word):
+            for cell in self.letter_cells.get(ch, ()):
+                r, c = divmod(cell, GRID_SIZE)
+                if c - j >= 0 and c - j + L <= GRID_SIZE:
+                    starts.add((r, c - j, 'H'))
+                if r - j >= 0 and r - j + L <= GRID_SIZE:
+                    starts.add((r - j, c, 'V'))
+        cands = []
+        for r, c, ori in starts:
+            ok, ov = self.can_place(word, r, c, ori)
+            if ok:
+                cands.append((ov, r, c, ori))
+        mid = GRID_SIZE // 2
+        cands.sort(key=lambda t: (-t[0], abs(t[1] - mid) + abs(t[2] - mid), t[1], t[2], t[3]))
+        return [(r, c, ori) for _, r, c, ori in cands]
+
+    def _search(self, remaining: List[int]) -> bool:
+        # Backtracking over the remaining words. Domains are recomputed after
+        # every placement and the word with the fewest options goes next (MRV).
+        # A word with no crossing yet is deferred, since placing another word
+        # can open one; the branch only fails when no remaining word can cross,
+        # or one never can because no other remaining word shares a letter
+        # with it (forward checking).
+        if not remaining:
+            return True
+        self._nodes += 1
+        if len(self.placements) > len(self._best_partial):
+            self._best_partial = [(p.word_id, p.row, p.col, p.orientation) for p in self.placements]
+        if self._nodes > MAX_SEARCH_NODES:
+            return False
+        domains = {w: self.crossings(self.entries[w]['answer_bytes']) for w in remaining}
+        ready = [w for w in remaining if domains[w]]
+        if not ready:
+            return False
+        if len(ready) < len(remaining):
+            for w in remaining:
+                letters = self.entries[w]['letters']
+                if not domains[w] and not any(letters & self.entries[o]['letters'] for o in remaining if o != w):
+                    return False
+        word_id = min(ready, key=lambda w: len(domains[w]))  # ties keep longest-first order
+        rest = [w for w in remaining if w != word_id]
+        for r, c, ori in domains[word_id]:
+            written = self.place(word_id, r, c, ori)
+            if self._search(rest):
+                return True
+            self.unplace(written)
+            if self._nodes > MAX_SEARCH_NODES:
+                break
+        return False
+
+    def _place_greedy(self, word_id: int):
+        # Best crossing if there is one, else the first free spot in reading order.
+        word = self.entries[word_id]['answer_bytes']
+        options = self.crossings(word)
+        if options:
+            self.place(word_id, *options[0])
+            return
+        for ori in ('H', 'V'):
+            for r in range(GRID_SIZE):
+                for c in range(GRID_SIZE):
+                    ok, _ = self.can_place(word, r, c, ori)
+                    if ok:
+                        self.place(word_id, r, c, ori)
+                        return
 
     def generate(self):
-        for idx, word_id in enumerate(self.order):
-            word = self.entries[word_id]['answer_norm']
-            placed = False
-            if idx == 0:
-                r = GRID_SIZE // 2
-                c = max(0, (GRID_SIZE - len(word)) // 2)
-                self.place(word_id, r, c, 'H')
-                placed = True
-            else:
-                best = None  # (overlaps, score_center, r, c, ori)
-                for r in range(GRID_SIZE):
-                    for c in range(GRID_SIZE):
-                        cell = self.grid[r][c]
-                        if cell is None:
-                            continue
-                        for j, ch in enumerate(word):
-                            if ch != cell:
-                                continue
-                            # Horizontal
-                            start_c = c - j
-                            ok, ov = self.can_place(word, r, start_c, 'H')
-                            if ok:
-                                score = (ov, -abs(r - GRID_SIZE // 2) - abs(start_c - GRID_SIZE // 2))
-                                cand = (score, r, start_c, 'H')
-                                if best is None or cand[0] > best[0]:
-                                    best = cand
-                            # Vertical
-                            start_r = r - j
-                            ok, ov = self.can_place(word, start_r, c, 'V')
-                            if ok:
-                                score = (ov, -abs(start_r - GRID_SIZE // 2) - abs(c - GRID_SIZE // 2))
-                                cand = (score, start_r, c, 'V')
-                                if best is None or cand[0] > best[0]:
-                                    best = cand
-                if best is not None and best[0][0] > 0:
-                    _, rr, cc, oo = best
-                    self.place(word_id, rr, cc, oo)
-                    placed = True
-                if not placed:
-                    for oo in ('H', 'V'):
-                        done = False
-                        for r in range(GRID_SIZE):
-                            for c in range(GRID_SIZE):
-                                ok, _ = self.can_place(word, r, c, oo)
-                                if ok:
-                                    self.place(word_id, r, c, oo)
-                                    done = placed = True
-                                    break
-                            if done:
-                                break
-                        if placed:
-                            break
+        first = self.order[0]
+        word = self.entries[first]['answer_bytes']
+        self.place(first, GRID_SIZE // 2, max(0, (GRID_SIZE - len(word)) // 2), 'H')
+        if not self._search(self.order[1:]):
+            # The search unwound back to the first word. Rebuild the deepest
+            # partial layout it reached and place the remaining words greedily.
+            for word_id, r, c, ori in self._best_partial[1:]:
+                self.place(word_id, r, c, ori)
+            placed = {p.word_id for p in self.placements}
+            for word_id in self.order:
+                if word_id not in placed:
+                    self._place_greedy(word_id)
         # Number by reading order
         self.placements.sort(key=lambda p: (p.row, p.col))
         for i, p in enumerate(self.placements, start=1):
             p.number = i
+        self.by_number = {p.number: p for p in self.placements}
 
     def to_state(self) -> Dict:
+        # Client-facing state: what the clue list needs. The table is rendered
+        # on the server, and the solution letters and answers stay there too.
         return {
-            'grid': self.grid,
-            'used_mask': self.used_mask,
-            'placements': [
+            'placements': tuple(
                 {
                     'number': p.number,
                     'row': p.row,
@@ -196,41 +289,116 @@ class Crossword:
                     'orientation': p.orientation,
                     'length': p.length,
                     'clue': self.entries[p.word_id]['clue'],
-                    'answer_original': self.entries[p.word_id]['answer_original'],
-                    'answer_norm': self.entries[p.word_id]['answer_norm'],
                 }
                 for p in self.placements
-            ],
+            ),
         }
 
 # -------------------------
 # Flask app
 # -------------------------
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson (compact output, UTF-8 kept as-is)."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response instead of decoding
+        # to str for Flask to encode again.
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, default=self.default), mimetype=self.mimetype)
+
 app = Flask(__name__)
 app.secret_key = 'crossword-secret-key'  # demo only
-
-def new_game():
-    cw = Crossword(RAW_ENTRIES)
-    cw.generate()
-    state = cw.to_state()
-    revealed = [[None if state['used_mask'][r][c] else '#' for c in range(GRID_SIZE)] for r in range(GRID_SIZE)]
-    session['state'] = state
-    session['revealed'] = revealed
-
-def get_game():
-    if 'state' not in session or 'revealed' not in session:
-        new_game()
-    return session['state'], session['revealed']
-
-def set_revealed(revealed):
-    session['revealed'] = revealed
-
-def all_solved(state, revealed) -> bool:
-    for r in range(GRID_SIZE):
-        for c in range(GRID_SIZE):
-            if state['used_mask'][r][c] and revealed[r][c] in (None, '#'):
-                return False
-    return True
+app.json = OrjsonProvider(app)
+
+# RAW_ENTRIES is constant and generate() is deterministic, so the crossword
+# is built once per process and every new game starts from a copy of it.
+# The values derived from it below are never modified after import.
+_CROSSWORD = Crossword(RAW_ENTRIES)
+_CROSSWORD.generate()
+_FROZEN = _CROSSWORD.to_state()
+# Revealed grids are flat row-major byte strings, like Crossword.grid: 0 for a
+# hidden letter, '#' for a block, the letter itself once revealed.
+_SOLUTION = np.frombuffer(bytes(_CROSSWORD.grid), dtype=np.uint8)
+_INITIAL_REVEALED = np.where(_SOLUTION != 0, 0, ord('#')).astype(np.uint8).tobytes()
+_SOLVED_REVEALED = np.where(_SOLUTION != 0, _SOLUTION, ord('#')).astype(np.uint8).tobytes()
+_BY_NUMBER = _CROSSWORD.by_number
+# Flat cell index -> numbers of the placements through it, so a correct answer
+# only rechecks the words it crosses.
+_NUMBERS_BY_CELL: Dict[int, List[int]] = defaultdict(list)
+for _p in _CROSSWORD.placements:
+    for _i in _p.cells_flat:
+        _NUMBERS_BY_CELL[_i].append(_p.number)
+del _p, _i
+# Cell/block layout for the server-rendered table.
+_USED_ROWS = (_SOLUTION != 0).reshape(GRID_SIZE, GRID_SIZE).tolist()
+
+# Games live in process memory; the session cookie only carries the game id.
+# A game only holds its revealed grid and solved clue numbers: the generated
+# state is the read-only _FROZEN shared by every game. A multi-process
+# deployment would need a shared store such as Redis instead of this dict.
+# GAMES is kept in last-use order; past MAX_GAMES the least recently used game
+# is dropped.
+MAX_GAMES = 10000
+GAMES: 'OrderedDict[str, Dict]' = OrderedDict()
+_GAMES_LOCK = threading.Lock()
+
+def new_game() -> Dict:
+    gid = session.get('gid')
+    game = {
+        'revealed': bytearray(_INITIAL_REVEALED),
+        'solved_ids': set(),
+        # Bumped after every change to revealed/solved_ids. state_json caches
+        # the /state body as (version it was built at, bytes) and is only
+        # served while that version is current, so a body built concurrently
+        # with a change can never be served after it.
+        'version': 0,
+        'state_json': None,
+    }
+    with _GAMES_LOCK:
+        if gid not in GAMES:
+            gid = secrets.token_urlsafe(8)
+            session['gid'] = gid
+        GAMES[gid] = game
+        GAMES.move_to_end(gid)
+        while len(GAMES) > MAX_GAMES:
+            GAMES.popitem(last=False)
+    return game
+
+def get_game() -> Tuple[Dict, bool]:
+    """The session's game and whether it had to be created, i.e. the client
+    had no game or it was evicted or lost with a restart."""
+    gid = session.get('gid')
+    with _GAMES_LOCK:
+        game = GAMES.get(gid)
+        if game is not None:
+            GAMES.move_to_end(gid)
+            return game, False
+    return new_game(), True
+
+def all_solved(game) -> bool:
+    return len(game['solved_ids']) == len(_BY_NUMBER)
+
+def mark_solved(game, placement: Placement) -> List[int]:
+    """Reveal a placement and record every word it completes; returns the
+    cells that were hidden before."""
+    revealed, solved = game['revealed'], game['solved_ids']
+    solved.add(placement.number)
+    written = []
+    for i in placement.cells_flat:
+        if revealed[i]:
+            continue
+        revealed[i] = _SOLVED_REVEALED[i]
+        written.append(i)
+        for number in _NUMBERS_BY_CELL[i]:
+            if number not in solved and all(revealed[j] for j in _BY_NUMBER[number].cells_flat):
+                solved.add(number)
+    return written
 
 HTML = r"""
 <!doctype html>
@@ -309,7 +477,13 @@ HTML = r"""
           <button id="resetBtn">Reiniciar</button>
         </div>
         <div class="status" id="status"></div>
-        <div id="grid"></div>
+        <div id="grid">
+          <table class="cg">
+          {%- for row in used_rows %}{% set r = loop.index0 %}
+            <tr>{% for used in row %}{% if used %}<td class="cell" id="c{{ r * size + loop.index0 }}"></td>{% else %}<td class="block"></td>{% endif %}{% endfor %}</tr>
+          {%- endfor %}
+          </table>
+        </div>
       </section>
 
       <aside class="side-card">
@@ -330,37 +504,40 @@ HTML = r"""
     const numEl = document.getElementById('answerNumber');
     const ansEl = document.getElementById('answerText');
 
-    function renderGrid(state, revealed){
-      const N = state.grid.length;
-      let html = '<table class="cg">';
-      for(let r=0;r<N;r++){
-        html += '<tr>';
-        for(let c=0;c<N;c++){
-          const used = state.used_mask[r][c];
-          if(!used){ html += '<td class="block"></td>'; continue; }
-          const ch = revealed[r][c];
-          html += `<td class="cell">${ch && ch !== '#' ? ch : ''}</td>`;
-        }
-        html += '</tr>';
+    // The table is rendered by the server; only letter cells are updated here.
+    const cellEls = new Map(Array.from(gridEl.querySelectorAll('td.cell'), td => [Number(td.id.slice(1)), td]));
+    let placements = null;
+
+    function renderGrid(revealed){
+      for(const [i, td] of cellEls){
+        const text = revealed[i] === '\0' ? '' : revealed[i];
+        if(td.textContent !== text) td.textContent = text;
       }
-      html += '</table>';
-      gridEl.innerHTML = html;
     }
 
-    function renderClues(state, revealed){
-      const entries = state.placements;
+    function applyDelta(delta){
+      for(const [i, ch] of delta) cellEls.get(i).textContent = ch;
+    }
+
+    // /answer and /reveal send a delta, or the whole grid when the server
+    // had to start a new game for this session.
+    function applyUpdate(data){
+      if(data.revealed !== undefined) renderGrid(atob(data.revealed));
+      else applyDelta(data.delta);
+      renderClues(data.solved_ids);
+    }
+
+    function renderClues(solvedIds){
+      // Until /bootstrap answers there is nothing to list; bootstrap() renders
+      // the clues once it does.
+      if(placements === null) return;
+      const entries = placements;
+      const solved = new Set(solvedIds);
       cluesEl.innerHTML = '';
-      let solvedCount = 0;
       for(const e of entries){
-        let isSolved = true;
-        if(e.orientation === 'H'){
-          for(let i=0;i<e.length;i++) if(!revealed[e.row][e.col+i] || revealed[e.row][e.col+i] === '#') { isSolved = false; break; }
-        } else {
-          for(let i=0;i<e.length;i++) if(!revealed[e.row+i][e.col] || revealed[e.row+i][e.col] === '#') { isSolved = false; break; }
-        }
-        if(isSolved) solvedCount++;
+        const isSolved = solved.has(e.number);
         const cls = isSolved ? 'clue solved' : 'clue';
-        const len = e.answer_norm.length;
+        const len = e.length;
         const pos = `(${String(e.row).padStart(2,'0')},${String(e.col).padStart(2,'0')})`;
         const ori = e.orientation;
         const title = `<span class="num-badge">${String(e.number).padStart(2,'0')}${ori}</span> ${pos} · ${len} letras`;
@@ -370,14 +547,21 @@ HTML = r"""
         div.onclick = () => { numEl.value = e.number; ansEl.focus(); };
         cluesEl.appendChild(div);
       }
-      progressEl.textContent = `${solvedCount}/${entries.length} resueltas`;
+      progressEl.textContent = `${solved.size}/${entries.length} resueltas`;
+    }
+
+    async function bootstrap(){
+      const r = await fetch('/bootstrap');
+      placements = (await r.json()).placements;
+      await fetchState();
     }
 
     async function fetchState(){
       const r = await fetch('/state');
       const data = await r.json();
-      renderGrid(data.state, data.revealed);
-      renderClues(data.state, data.revealed);
+      const revealed = atob(data.revealed);
+      renderGrid(revealed);
+      renderClues(data.solved_ids);
       if(data.solved){ statusEl.textContent = '🎉 ¡Completado!'; }
     }
 
@@ -388,8 +572,7 @@ HTML = r"""
       const r = await fetch('/answer', { method:'POST', headers:{'Content-Type':'application/json'}, body: JSON.stringify({ number, guess }) });
       const data = await r.json();
       statusEl.textContent = data.message;
-      renderGrid(data.state, data.revealed);
-      renderClues(data.state, data.revealed);
+      applyUpdate(data);
       if(data.solved){ statusEl.textContent += ' · 🎉 ¡Completado!'; }
       ansEl.value='';
     }
@@ -399,8 +582,7 @@ HTML = r"""
       const r = await fetch('/reveal', { method:'POST' });
       const data = await r.json();
       statusEl.textContent = 'Solución mostrada.';
-      renderGrid(data.state, data.revealed);
-      renderClues(data.state, data.revealed);
+      applyUpdate(data);
     };
     document.getElementById('resetBtn').onclick = async ()=>{
       await fetch('/reset', { method:'POST' });
@@ -409,75 +591,95 @@ HTML = r"""
     };
     ansEl.addEventListener('keydown', (e)=>{ if(e.key==='Enter'){ submitAnswer(); }});
 
-    fetchState();
+    bootstrap();
   </script>
 </body>
 </html>
 """
 
+# The page only depends on the frozen layout, so it is rendered once at import.
+_INDEX_HTML = app.jinja_env.from_string(HTML).render(used_rows=_USED_ROWS, size=GRID_SIZE).encode('utf-8')
+# The layout and clues never change; the client fetches them once.
+_BOOTSTRAP_JSON = orjson.dumps(_FROZEN)
+
 @app.route('/')
 def index():
-    get_game()
-    return render_template_string(HTML)
+    # The game is created by the page's first /state call, so clients that
+    # only fetch the page (crawlers, health checks) don't take a slot.
+    return app.response_class(_INDEX_HTML, mimetype='text/html')
+
+@app.route('/bootstrap')
+def bootstrap():
+    return app.response_class(_BOOTSTRAP_JSON, mimetype=app.json.mimetype)
 
 @app.route('/state')
 def state():
-    state, revealed = get_game()
-    return jsonify({'state': state, 'revealed': revealed, 'solved': all_solved(state, revealed)})
+    game, _ = get_game()
+    version = game['version']
+    cached = game['state_json']
+    if cached is None or cached[0] != version:
+        cached = game['state_json'] = (version, orjson.dumps(_payload_state(game)))
+    return app.response_class(cached[1], mimetype=app.json.mimetype)
 
 @app.route('/answer', methods=['POST'])
 def answer():
+    game, created = get_game()
     payload = request.get_json(force=True)
     try:
         number = int(str(payload.get('number', '')).strip())
     except ValueError:
-        return jsonify({'ok': False, 'message': 'Número inválido.', **_payload_state()} )
+        return jsonify({'ok': False, 'message': 'Número inválido.', **_payload_delta(game, (), created)})
     guess = str(payload.get('guess', '')).strip()
 
-    state, revealed = get_game()
-    placement = next((p for p in state['placements'] if p['number'] == number), None)
-    if not placement:
-        return jsonify({'ok': False, 'message': 'No existe una pista con ese número.', **_payload_state()})
+    placement = _BY_NUMBER.get(number)
+    if placement is None:
+        return jsonify({'ok': False, 'message': 'No existe una pista con ese número.', **_payload_delta(game, (), created)})
+    entry = _CROSSWORD.entries[placement.word_id]
 
     norm_guess = normalize_answer(guess)
-    if norm_guess == placement['answer_norm']:
-        if placement['orientation'] == 'H':
-            for i in range(placement['length']):
-                r, c = placement['row'], placement['col'] + i
-                revealed[r][c] = state['grid'][r][c]
-        else:
-            for i in range(placement['length']):
-                r, c = placement['row'] + i, placement['col']
-                revealed[r][c] = state['grid'][r][c]
-        set_revealed(revealed)
-        msg = f"✅ Correcto: {placement['answer_original']}"
+    if norm_guess == entry['answer_norm']:
+        written = mark_solved(game, placement)
+        game['version'] += 1
+        msg = f"✅ Correcto: {entry['answer_original']}"
         ok = True
     else:
         msg = "❌ Incorrecto. Revisa ortografía (se ignoran acentos/espacios)."
         ok = False
-    s, rv = get_game()
-    return jsonify({'ok': ok, 'message': msg, 'state': s, 'revealed': rv, 'solved': all_solved(s, rv)})
+        written = ()
+    return jsonify({'ok': ok, 'message': msg, **_payload_delta(game, written, created)})
 
 @app.route('/reveal', methods=['POST'])
 def reveal():
-    state, revealed = get_game()
-    for r in range(GRID_SIZE):
-        for c in range(GRID_SIZE):
-            if state['used_mask'][r][c]:
-                revealed[r][c] = state['grid'][r][c]
-    set_revealed(revealed)
-    s, rv = get_game()
-    return jsonify({'state': s, 'revealed': rv, 'solved': True})
+    game, created = get_game()
+    written = [i for i, ch in enumerate(game['revealed']) if not ch]
+    game['revealed'] = bytearray(_SOLVED_REVEALED)
+    game['solved_ids'] = set(_BY_NUMBER)
+    game['version'] += 1
+    return jsonify(_payload_delta(game, written, created))
 
 @app.route('/reset', methods=['POST'])
 def reset():
-    new_game()
-    s, rv = get_game()
-    return jsonify({'state': s, 'revealed': rv, 'solved': False})
+    game = new_game()
+    return jsonify(_payload_state(game))
+
+def _payload_state(game):
+    return {
+        'revealed': base64.b64encode(game['revealed']).decode('ascii'),
+        'solved_ids': sorted(game['solved_ids']),
+        'solved': all_solved(game),
+    }
 
-def _payload_state():
-    s, rv = get_game()
-    return {'state': s, 'revealed': rv, 'solved': all_solved(s, rv)}
+def _payload_delta(game, written, created=False):
+    # Only the cells that just changed, as [flat index, letter] pairs. A game
+    # created by this request is sent whole instead: the page still shows the
+    # one that was lost.
+    if created:
+        return _payload_state(game)
+    return {
+        'delta': [(i, chr(_SOLVED_REVEALED[i])) for i in written],
+        'solved_ids': sorted(game['solved_ids']),
+        'solved': all_solved(game),
+    }
 
 if __name__ == '__main__':
     import os
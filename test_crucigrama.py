@@ -0,0 +1,83 @@
+import base64
+
+import crucigrama
+from crucigrama import Crossword, GRID_SIZE, _BY_NUMBER, _CROSSWORD, _SOLVED_REVEALED, app
+
+# Only GHK crosses the first word; KLM and MNO can only cross the words
+# placed after it.
+CHAINED = [('a', 'ABCDEFG'), ('b', 'GHK'), ('c', 'KLM'), ('d', 'MNO')]
+
+
+def test_search_defers_words_without_a_crossing_yet():
+    cw = Crossword(CHAINED)
+    cw.place(0, GRID_SIZE // 2, 10, 'H')
+    assert cw._search([1, 2, 3])
+    assert len(cw.placements) == 4
+
+
+def test_search_fails_for_a_word_that_can_never_cross():
+    cw = Crossword([('a', 'ABCDEFG'), ('b', 'GHK'), ('c', 'XYZ')])
+    cw.place(0, GRID_SIZE // 2, 10, 'H')
+    assert not cw._search([1, 2])
+
+
+def test_generate_connects_chained_words():
+    cw = Crossword(CHAINED)
+    cw.generate()
+    cells = [set(p.cells_flat) for p in cw.placements]
+    assert len(cells) == 4
+    for i, own in enumerate(cells):
+        assert any(own & other for j, other in enumerate(cells) if j != i)
+
+
+def test_can_place_rejects_a_word_laid_over_a_parallel_one():
+    cw = Crossword([('a', 'ZOONOSIS'), ('b', 'ANTROPOZOONOSIS')])
+    cw.place(0, 10, 14, 'V')
+    assert cw.can_place(cw.entries[1]['answer_bytes'], 3, 14, 'V') == (False, 0)
+    # Crossing ZOONOSIS at its Z is fine, and unplace() clears the H bits.
+    assert cw.can_place(cw.entries[1]['answer_bytes'], 10, 7, 'H') == (True, 1)
+    cw.unplace(cw.place(1, 10, 7, 'H'))
+    assert [cw.cell_ori[i] for i in cw.placements[0].cells_flat] == [2] * 8
+    assert cw.cell_ori.count(0) == len(cw.cell_ori) - 8
+
+
+def test_generated_words_only_share_cells_at_crossings():
+    for ori in ('H', 'V'):
+        seen = set()
+        for p in _CROSSWORD.placements:
+            if p.orientation == ori:
+                assert seen.isdisjoint(p.cells_flat), p
+                seen.update(p.cells_flat)
+
+
+def _answer(client, number):
+    answer = _CROSSWORD.entries[_BY_NUMBER[number].word_id]['answer_original']
+    return client.post('/answer', json={'number': number, 'guess': answer}).get_json()
+
+
+def test_answer_sends_only_the_new_cells():
+    client = app.test_client()
+    client.get('/state')
+    first = _answer(client, 1)
+    assert 'revealed' not in first
+    assert first['delta'] == [[i, chr(_SOLVED_REVEALED[i])] for i in _BY_NUMBER[1].cells_flat]
+    second = _answer(client, 2)
+    shared = set(_BY_NUMBER[1].cells_flat)
+    assert [i for i, _ in second['delta']] == [i for i in _BY_NUMBER[2].cells_flat if i not in shared]
+    assert second['solved_ids'][:2] == [1, 2]
+
+
+def test_answer_sends_the_whole_grid_when_the_game_was_lost():
+    client = app.test_client()
+    client.get('/state')
+    for number in (1, 2, 3):
+        _answer(client, number)
+    crucigrama.GAMES.clear()  # evicted, or the process restarted
+    data = _answer(client, 4)
+    assert 'delta' not in data
+    assert data['solved_ids'] == [4]
+    revealed = base64.b64decode(data['revealed'])
+    shown = {i for i, ch in enumerate(revealed) if ch not in (0, ord('#'))}
+    assert shown == set(_BY_NUMBER[4].cells_flat)
+    # Later answers go back to deltas for the new game.
+    assert 'delta' in _answer(client, 5)